@@ -1,4 +1,5 @@
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from simulation import run_simulation
 
@@ -14,7 +15,12 @@ def simulate():
     data = request.get_json()
     try:
         result = run_simulation(data)
-        return jsonify({"status": "success", "result": result})
+        # orjson writes the NumPy trajectories straight from their buffers
+        body = orjson.dumps(
+            {"status": "success", "result": result},
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        return Response(body, mimetype='application/json')
     except Exception as e:
         print("ERROR during simulation:", str(e))  # <-- This line shows us the real error!
         return jsonify({"status": "error", "message": str(e)}), 500
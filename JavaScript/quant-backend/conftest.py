@@ -0,0 +1,3 @@
+# test_simulation.py is a manual script that posts to a running server,
+# so keep pytest from importing it during collection
+collect_ignore = ["test_simulation.py"]
@@ -0,0 +1,78 @@
+# ======================================
+# 🚀 GUNICORN SETTINGS FOR THE QUANT BACKEND
+# ======================================
+#
+# Run with:  gunicorn -c gunicorn.conf.py app:app
+#
+# /simulate is CPU-bound, so requests are spread over one sync worker
+# process per physical CPU core instead of sharing one interpreter (and one GIL).
+
+import math
+import os
+
+
+def physical_cores():
+    """
+    Number of physical cores (hyper-threads of one core counted once), read from
+    /proc/cpuinfo on Linux. Falls back to os.cpu_count(), which counts logical CPUs.
+    """
+    try:
+        cores = set()
+        physical_id = core_id = None
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                key, _, value = line.partition(":")
+                key = key.strip()
+                if key == "physical id":
+                    physical_id = value.strip()
+                elif key == "core id":
+                    core_id = value.strip()
+                elif not key and core_id is not None:
+                    cores.add((physical_id, core_id))
+                    physical_id = core_id = None
+        if core_id is not None:
+            cores.add((physical_id, core_id))
+        if cores:
+            return len(cores)
+    except OSError:
+        pass
+    return os.cpu_count() or 1
+
+
+def available_cpus():
+    """
+    CPUs this process may actually use: its affinity mask and, in a container,
+    the cgroup v2 CPU quota (/sys/fs/cgroup/cpu.max). None if neither is known.
+    """
+    limits = []
+    if hasattr(os, "sched_getaffinity"):
+        limits.append(len(os.sched_getaffinity(0)))
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()[:2]
+        if quota != "max":
+            limits.append(max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return min(limits) if limits else None
+
+
+# Loopback only by default (the backend is CORS-open); set BIND to expose it
+bind = os.environ.get("BIND", "127.0.0.1:5000")
+
+# One worker per physical core, capped by the CPUs this process may use
+# (affinity / container quota); override with WEB_CONCURRENCY
+default_workers = physical_cores()
+cpu_limit = available_cpus()
+if cpu_limit is not None:
+    default_workers = min(default_workers, cpu_limit)
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+worker_class = "sync"
+timeout = 120
+
+# Import the app once in the master process so the numba kernels are compiled
+# (or loaded from the on-disk cache) before the workers are forked. This is only
+# safe because the kernels run at import are serial: a parallel=True kernel
+# would start numba's threading layer in the master, and a process that forks
+# after that cannot shut down cleanly. Keep parallel kernels out of the warmup.
+preload_app = True
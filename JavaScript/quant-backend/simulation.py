@@ -2,15 +2,41 @@
 # 📦 1. IMPORT LIBRARIES
 # ======================
 
+from functools import lru_cache  # for caching the default fund schedules
+
 import numpy as np                # for numerical arrays and math
-import pandas as pd              # for working with tabular data
-import numpy_financial as npf    # for calculating IRR (internal rate of return)
+from numba import njit           # for compiling the sequential NAV / cash loops
 
 
 # ======================================
 # 🧱 2. DEFINE THE PRIVATEINVESTMENT CLASS
 # ======================================
 
+# Rows of a fund's [3, fund_life] schedule buffer
+CALL_ROW, GROWTH_ROW, DIST_ROW = 0, 1, 2
+
+
+@lru_cache(maxsize=16)
+def _defaults(fund_life):
+    """
+    Default [3, fund_life] schedule buffer (calls, NAV growth, distributions).
+    It is identical for every fund of the same length, so it is built once
+    and shared; the array is read-only to keep that sharing safe.
+    """
+    schedule = np.zeros((3, fund_life), dtype=np.float64)
+
+    schedule[CALL_ROW, :60] = 0.2 / 60    # Equal calls per month over the first 5 years
+
+    schedule[GROWTH_ROW, :24] = 0.99      # drag
+    schedule[GROWTH_ROW, 24:60] = 1.01    # slow growth
+    schedule[GROWTH_ROW, 60:] = 1.03      # higher growth
+
+    schedule[DIST_ROW, 60:] = 0.02        # 2% of commitment per month after year 5
+
+    schedule.setflags(write=False)
+    return schedule
+
+
 class PrivateInvestment:
     """
     This class models a private market investment (e.g., VC, PE, Real Assets)
@@ -30,14 +56,23 @@ class PrivateInvestment:
         self.start_month = start_month
         self.fund_life = fund_life
 
-        # If no schedule is passed, use default behavior
-        self.call_schedule = call_schedule or self.default_call_schedule()
-        self.nav_growth_schedule = nav_growth_schedule or self.default_nav_growth()
-        self.distribution_schedule = distribution_schedule or self.default_distributions()
-
-        # Output lists to track results
-        self.nav_history = []
-        self.cash_flows = []
+        # All three schedules live in one contiguous [3, fund_life] buffer
+        # (rows CALL_ROW, GROWTH_ROW, DIST_ROW). If no schedule is passed, use
+        # default behavior: the shared cached buffer when nothing is customised
+        # (uses_default_schedule records that case).
+        custom = (call_schedule, nav_growth_schedule, distribution_schedule)
+        self.uses_default_schedule = all(rows is None for rows in custom)
+        if self.uses_default_schedule:
+            self.schedule = _defaults(fund_life)
+        else:
+            self.schedule = _defaults(fund_life).copy()
+            for row, values in zip((CALL_ROW, GROWTH_ROW, DIST_ROW), custom):
+                if values is not None:
+                    self.schedule[row] = values
+
+        # Output arrays to track results
+        self.nav_history = np.empty(0)
+        self.cash_flows = np.empty(0)
 
         # Run the simulation upon initialization
         self.simulate()
@@ -46,10 +81,7 @@ class PrivateInvestment:
         """
         Spread 20% capital calls evenly over the first 5 years (60 months).
         """
-        schedule = [0] * self.fund_life
-        for i in range(60):
-            schedule[i] = 0.2 / 60  # Equal calls per month
-        return schedule
+        return _defaults(self.fund_life)[CALL_ROW].copy()
 
     def default_nav_growth(self):
         """
@@ -58,53 +90,99 @@ class PrivateInvestment:
         - Years 3–5: slow growth
         - After 5 years: higher growth
         """
-        growth = [0] * self.fund_life
-        for i in range(self.fund_life):
-            if i < 24:
-                growth[i] = 0.99  # drag
-            elif i < 60:
-                growth[i] = 1.01  # slow growth
-            else:
-                growth[i] = 1.03  # higher growth
-        return growth
+        return _defaults(self.fund_life)[GROWTH_ROW].copy()
 
     def default_distributions(self):
         """
         Start distributing 2% of commitment per month after year 5.
         """
-        dist = [0] * self.fund_life
-        for i in range(60, self.fund_life):
-            dist[i] = 0.02
-        return dist
+        return _defaults(self.fund_life)[DIST_ROW].copy()
 
     def simulate(self):
         """
         Run the NAV and cash flow simulation.
         Tracks NAV and net cash flow (calls = negative, distributions = positive).
         """
-        nav = 0
-        total_called = 0
-        cash_flows = []
-        navs = []
+        commitments = np.array([self.commitment], dtype=np.float64)
+        if self.fund_life == 120 and self.uses_default_schedule:
+            navs, cash_flows = _simulate_default_120(commitments)
+        else:
+            navs, cash_flows = simulate_private_batch(commitments, self.schedule[np.newaxis])
+        self.nav_history = navs[0]
+        self.cash_flows = cash_flows[0]
 
-        for i in range(self.fund_life):
-            # Capital called this month
-            call = self.call_schedule[i] * self.commitment
-            total_called += call
 
-            # Grow NAV based on previous NAV + new call
-            nav = nav * self.nav_growth_schedule[i] + call
+def simulate_private_batch(commitments, schedules):
+    """
+    Simulate many private funds at once, one fund per row.
 
-            # Distribute based on schedule (from NAV)
-            dist = self.distribution_schedule[i] * self.commitment
-            nav = max(nav - dist, 0)
+    commitments has shape [n_funds]; schedules has shape [n_funds, 3, fund_life]
+    (each fund's schedule buffer). Returns (navs, cash_flows), both [n_funds, fund_life].
+    """
+    return _simulate_private_batch(
+        np.ascontiguousarray(commitments, dtype=np.float64),
+        np.ascontiguousarray(schedules, dtype=np.float64)
+    )
 
-            # Track history
-            navs.append(nav)
-            cash_flows.append(-call + dist)  # Net cash flow = dist - call
 
-        self.nav_history = navs
-        self.cash_flows = cash_flows
+@njit(nogil=True, cache=True, fastmath=True)
+def _simulate_private_batch(commitments, schedules):
+    """
+    Month-by-month NAV loop for every fund, with the NAV floored at zero after
+    distributions. Kept serial (no parallel=True): numba's threading layer must
+    not be started in the gunicorn master before it forks workers, each worker
+    already has its own core, and typical requests hold only a few funds.
+    """
+    n_funds = schedules.shape[0]
+    fund_life = schedules.shape[2]
+    navs = np.empty((n_funds, fund_life))
+    cash_flows = np.empty((n_funds, fund_life))
+    for f in range(n_funds):
+        nav = 0.0
+        for i in range(fund_life):
+            # Grow NAV based on previous NAV + new call, then distribute
+            call = schedules[f, CALL_ROW, i] * commitments[f]
+            dist = schedules[f, DIST_ROW, i] * commitments[f]
+            nav = nav * schedules[f, GROWTH_ROW, i] + call
+            nav = max(nav - dist, 0.0)
+            navs[f, i] = nav
+            cash_flows[f, i] = dist - call  # Net cash flow = dist - call
+    return navs, cash_flows
+
+
+@njit(nogil=True, cache=True)
+def _simulate_default_120(commitments):
+    """
+    Specialized batch simulation for 120-month funds on the default schedules
+    (see _defaults): each J-curve region is its own loop with the call,
+    growth and distribution constants inlined. Returns (navs, cash_flows).
+    """
+    n_funds = commitments.shape[0]
+    navs = np.empty((n_funds, 120))
+    cash_flows = np.empty((n_funds, 120))
+    for f in range(n_funds):
+        call = commitments[f] * (0.2 / 60)
+        dist = commitments[f] * 0.02
+        nav = 0.0
+
+        # Years 1-2: calls with drag
+        for i in range(24):
+            nav = max(nav * 0.99 + call, 0.0)
+            navs[f, i] = nav
+            cash_flows[f, i] = -call
+
+        # Years 3-5: calls with slow growth
+        for i in range(24, 60):
+            nav = max(nav * 1.01 + call, 0.0)
+            navs[f, i] = nav
+            cash_flows[f, i] = -call
+
+        # Years 6-10: no calls, higher growth, distributions
+        for i in range(60, 120):
+            nav = max(nav * 1.03 - dist, 0.0)
+            navs[f, i] = nav
+            cash_flows[f, i] = dist
+    return navs, cash_flows
 
 
 # ===========================================
@@ -114,8 +192,10 @@ class PrivateInvestment:
 def simulate_total_portfolio(
     initial_capital,
     public_weights,
-    returns_df,
-    private_investments,
+    returns_arr,
+    private_navs,
+    private_cash_flows,
+    private_start_months=None,  # Month each fund starts (default: all at month 0)
     n_months=120,
     cash_rate=0.02  # 2% annual interest on unused cash
 ):
@@ -124,53 +204,73 @@ def simulate_total_portfolio(
     - Public assets (stocks, bonds, etc.)
     - Private investments (VC/PE)
     - Cash account for liquidity buffer
+
+    private_navs and private_cash_flows are per-fund trajectories of shape
+    [n_funds, fund_life], as returned by simulate_private_batch. Fund k's
+    month 0 lands on portfolio month private_start_months[k]; a negative start
+    means the fund began before the simulation, so its first months are dropped.
     """
-    assert len(public_weights) == returns_df.shape[1], "Mismatch between weights and asset columns"
+    weights = np.asarray(public_weights, dtype=np.float64)
+    returns_arr = np.asarray(returns_arr, dtype=np.float64)
+    assert len(weights) == returns_arr.shape[1], "Mismatch between weights and asset columns"
 
     # Allocate starting capital
-    public_value = initial_capital * sum(public_weights)
-    cash_balance = initial_capital * (1 - sum(public_weights))
-
-    # Track portfolio values over time
-    public_values = [public_value]
-    private_navs = [sum([pi.nav_history[0] for pi in private_investments])]
-    cash_balances = [cash_balance]
-    total_values = [public_value + private_navs[-1] + cash_balance]
-
-    # Simulate month-by-month
-    for month in range(1, n_months):
-        # Apply public market returns
-        monthly_returns = returns_df.iloc[month % len(returns_df)].values
-        public_value *= (1 + np.dot(public_weights, monthly_returns))
-        public_values.append(public_value)
-
-        # Private NAV and cash flow
-        private_nav = 0
-        net_private_cashflow = 0
-        for pi in private_investments:
-            if month < len(pi.cash_flows):
-                private_nav += pi.nav_history[month]
-                net_private_cashflow += pi.cash_flows[month]
-
-        private_navs.append(private_nav)
-
-        # Update cash with private market cash flows and interest
-        cash_balance += net_private_cashflow
-        cash_balance *= (1 + cash_rate / 12)
-        cash_balances.append(cash_balance)
-
-        # Total value = public + private + cash
-        total = public_value + private_nav + cash_balance
-        total_values.append(total)
+    public_value = initial_capital * weights.sum()
+    cash_balance = initial_capital * (1 - weights.sum())
+
+    # Public markets: one matrix-vector product (BLAS gemv) gives every row's
+    # portfolio return. Month m uses row m % len(returns_arr) from month 1 on,
+    # i.e. the rows starting at row 1, repeated cyclically (np.resize tiles).
+    port_returns = returns_arr @ weights
+    public_values = np.empty(n_months)
+    public_values[0] = public_value
+    public_values[1:] = 1 + np.resize(np.roll(port_returns, -1), n_months - 1)
+    np.cumprod(public_values, out=public_values)
+
+    # Private NAV and cash flow summed across funds once, each fund shifted to
+    # its start month (zero before it starts and after it ends)
+    private_nav_total = np.zeros(n_months)
+    net_private_cashflows = np.zeros(n_months)
+    if private_start_months is None:
+        private_start_months = np.zeros(len(private_navs), dtype=np.int64)
+
+    for start in np.unique(private_start_months):
+        first = max(start, 0)       # first portfolio month the fund covers
+        skipped = max(-start, 0)    # fund months that fall before month 0
+        life = min(private_navs.shape[1] - skipped, n_months - first)
+        if life <= 0:
+            continue
+        funds = private_start_months == start
+        private_nav_total[first:first + life] += private_navs[funds, skipped:skipped + life].sum(axis=0)
+        net_private_cashflows[first:first + life] += private_cash_flows[funds, skipped:skipped + life].sum(axis=0)
+
+    # Update cash with private market cash flows and interest
+    cash_balances = _cash_recurrence(net_private_cashflows, cash_balance, cash_rate / 12)
+
+    # Total value = public + private + cash
+    total_values = public_values + private_nav_total + cash_balances
 
     return {
         "public": public_values,
-        "private": private_navs,
+        "private": private_nav_total,
         "cash": cash_balances,
         "total": total_values
     }
 
 
+@njit(cache=True, fastmath=True)
+def _cash_recurrence(cf_array, cash0, monthly_rate):
+    """
+    Cash balance path: cash[t] = (cash[t-1] + cf[t]) * (1 + monthly_rate).
+    Month 0 is the starting balance, so cf_array[0] is not applied.
+    """
+    cash = np.empty(cf_array.shape[0])
+    cash[0] = cash0
+    for t in range(1, cf_array.shape[0]):
+        cash[t] = (cash[t - 1] + cf_array[t]) * (1 + monthly_rate)
+    return cash
+
+
 # ===================================================
 # 📊 4. CALCULATE PORTFOLIO PERFORMANCE METRICS
 # ===================================================
@@ -178,6 +278,7 @@ def simulate_total_portfolio(
 def calculate_total_portfolio_metrics(portfolio_result, initial_capital, risk_free_rate=0.02):
     """
     Calculate key performance stats for the total portfolio.
+    Expects the float64 arrays returned by simulate_total_portfolio.
     """
     total_values = portfolio_result['total']
     public_values = portfolio_result['public']
@@ -193,17 +294,15 @@ def calculate_total_portfolio_metrics(portfolio_result, initial_capital, risk_fr
     annualized_return = (final_value / initial_capital) ** (1 / n_years) - 1
     cumulative_return = final_value / initial_capital - 1
 
-    # Risk metrics
-    monthly_returns = np.diff(total_values) / total_values[:-1]
-    annualized_volatility = np.std(monthly_returns) * np.sqrt(12)
-
-    running_max = np.maximum.accumulate(total_values)
-    drawdowns = (running_max - total_values) / running_max
-    max_drawdown = np.max(drawdowns)
+    # Risk metrics (monthly return variance and max drawdown in one pass)
+    _, monthly_variance, max_drawdown = _metrics_pass(total_values)
+    annualized_volatility = np.sqrt(monthly_variance * 12)
 
     # Cash flow-based IRR
-    cash_flows = [-initial_capital] + list(np.diff(total_values))
-    irr = npf.irr(cash_flows)
+    cash_flows = np.empty(len(total_values))
+    cash_flows[0] = -initial_capital
+    np.subtract(total_values[1:], total_values[:-1], out=cash_flows[1:])
+    irr = _irr(cash_flows)
 
     # Final allocation
     total_final = final_value
@@ -225,10 +324,126 @@ def calculate_total_portfolio_metrics(portfolio_result, initial_capital, risk_fr
     }
 
 
+@njit(cache=True, error_model='numpy')
+def _metrics_pass(total):
+    """
+    Single pass over the total value path returning the mean and (population)
+    variance of monthly returns via Welford's update, plus the max drawdown.
+    """
+    mean = 0.0
+    m2 = 0.0
+    n = 0
+    running_max = total[0]
+    max_drawdown = 0.0
+    for i in range(1, total.shape[0]):
+        r = (total[i] - total[i - 1]) / total[i - 1]
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+
+        if total[i] > running_max:
+            running_max = total[i]
+        drawdown = (running_max - total[i]) / running_max
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    if n == 0:
+        return np.nan, np.nan, max_drawdown
+    return mean, m2 / n, max_drawdown
+
+
+@njit(cache=True)
+def _scaled_npv(cf, u):
+    """
+    NPV at rate r = exp(u) - 1, up to a positive factor (only its sign is used).
+    With x = 1 / (1 + r), NPV is the polynomial sum(cf[t] * x**t). For x <= 1 it
+    is evaluated directly with Horner's scheme; for x > 1 it is divided by
+    x**(n - 1) and evaluated in 1 / x instead, so large x cannot overflow.
+    """
+    acc = 0.0
+    if u >= 0.0:
+        x = np.exp(-u)
+        for t in range(cf.shape[0] - 1, -1, -1):
+            acc = acc * x + cf[t]
+    else:
+        y = np.exp(u)
+        for t in range(cf.shape[0]):
+            acc = acc * y + cf[t]
+    return acc
+
+
+@njit(cache=True)
+def _bisect_log_rate(cf, lo, f_lo, hi, tol=1e-13):
+    """
+    Bisection for the NPV root between u = lo and u = hi (a sign change bracket).
+    """
+    while abs(hi - lo) > tol:
+        mid = 0.5 * (lo + hi)
+        f_mid = _scaled_npv(cf, mid)
+        if f_mid == 0.0:
+            return mid
+        if (f_mid > 0.0) == (f_lo > 0.0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+@njit(cache=True)
+def _irr(cf):
+    """
+    Internal rate of return: the root of NPV(r) = sum(cf[t] / (1 + r)**t)
+    closest to zero, as npf.irr picks. Rates are searched in u = log(1 + r),
+    walking outward from 0 on a geometric grid in each direction; the first
+    sign change on each side brackets the closest root there, which is then
+    refined by bisection. Returns NaN if NPV never changes sign.
+    """
+    f_zero = _scaled_npv(cf, 0.0)
+    if f_zero == 0.0:
+        return 0.0
+
+    best = np.nan
+    for direction in (1.0, -1.0):
+        u_prev, f_prev = 0.0, f_zero
+        step = 1e-6
+        while step <= 12.0:  # |u| up to 12: r from -99.9994% to +16 million %
+            u = direction * step
+            f = _scaled_npv(cf, u)
+            if f == 0.0 or (f > 0.0) != (f_prev > 0.0):
+                if f == 0.0:
+                    root = u
+                else:
+                    root = _bisect_log_rate(cf, u_prev, f_prev, u)
+                rate = np.exp(root) - 1.0
+                if np.isnan(best) or abs(rate) < abs(best):
+                    best = rate
+                break
+            u_prev, f_prev = u, f
+            step *= 1.15
+    return best
+
+
 # =====================================================
 # 🚀 5. FLASK WRAPPER: run_simulation(input_data)
 # =====================================================
 
+def _parse_start_month(value):
+    """
+    Coerce a request's start_month to an int. A missing value or null (the
+    frontend sends null when the field parses to NaN) means month 0.
+    """
+    if value is None or value == "":
+        return 0
+    try:
+        months = float(value)
+    except (TypeError, ValueError):
+        months = float("nan")
+    if not months.is_integer():
+        raise ValueError(f"Invalid start_month {value!r}: expected a whole number of months")
+    return int(months)
+
+
 def run_simulation(input_data):
     """
     This is the main function called by Flask when the user hits /simulate
@@ -245,35 +460,64 @@ def run_simulation(input_data):
     private_commitments = input_data["private_commitments"]
     returns_data = input_data["returns_data"]
 
-    # Create DataFrame of historical monthly returns
-    returns_df = pd.DataFrame(returns_data)
-    returns_df = returns_df[list(weights_dict.keys())]  # ensure correct order
-
-    # Convert weight dict to list (ordered)
-    weights = [weights_dict[col] for col in returns_df.columns]
-
-    # Create private investment objects
-    private_investments = []
-    for item in private_commitments:
-        pi = PrivateInvestment(
-            commitment=item["commitment"],
-            start_month=item.get("start_month", 0)
-        )
-        private_investments.append(pi)
+    # Matrix of historical monthly returns, columns in the same order as the weights.
+    # returns_data is either a list of row dicts or a dict of per-asset columns
+    assets = list(weights_dict.keys())
+    if isinstance(returns_data, dict):
+        returns_arr = np.column_stack([np.asarray(returns_data[asset], dtype=np.float64) for asset in assets])
+    else:
+        returns_arr = np.array([[row[asset] for asset in assets] for row in returns_data], dtype=np.float64)
+    weights = np.array([weights_dict[asset] for asset in assets], dtype=np.float64)
+
+    # Private commitments, simulated together below
+    n_funds = len(private_commitments)
+    commitments = np.empty(n_funds)
+    start_months = np.empty(n_funds, dtype=np.int64)
+    for row, item in enumerate(private_commitments):
+        commitments[row] = item["commitment"]
+        start_months[row] = _parse_start_month(item.get("start_month"))
+
+    # Every fund here uses the default 120-month fund life and schedules,
+    # so the whole batch goes through the specialized kernel
+    private_navs, private_cash_flows = _simulate_default_120(commitments)
 
     # Run simulation
     portfolio_result = simulate_total_portfolio(
         initial_capital=initial_capital,
         public_weights=weights,
-        returns_df=returns_df,
-        private_investments=private_investments,
-        n_months=len(returns_df)
+        returns_arr=returns_arr,
+        private_navs=private_navs,
+        private_cash_flows=private_cash_flows,
+        private_start_months=start_months,
+        n_months=len(returns_arr)
     )
 
     # Compute performance stats
     metrics = calculate_total_portfolio_metrics(portfolio_result, initial_capital)
 
+    # Trajectories stay NumPy arrays; app.py serializes them directly with orjson
     return {
         "portfolio": portfolio_result,
         "metrics": metrics
     }
+
+
+# =====================================================
+# 🔥 6. WARM UP THE COMPILED KERNELS
+# =====================================================
+
+def _warmup():
+    """
+    Call every numba kernel once on tiny inputs of the dtypes used at runtime so
+    compilation (or loading from the on-disk cache) happens at import, not on
+    the first request.
+    """
+    values = np.ones(2)
+    _simulate_private_batch(values, np.ones((2, 3, 2)))
+    _simulate_default_120(values)
+    _cash_recurrence(values, 0.0, 0.0)
+    _metrics_pass(values)
+    _irr(np.array([-1.0, 1.0]))
+
+
+_warmup()
@@ -0,0 +1,242 @@
+# ======================================
+# 🧪 NUMERIC CHECKS FOR simulation.py
+# ======================================
+#
+# Install test dependencies:  pip install -r requirements-dev.txt
+# Run with:  python -m pytest -q
+
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from simulation import (
+    PrivateInvestment,
+    _irr,
+    _parse_start_month,
+    run_simulation,
+    simulate_total_portfolio,
+)
+
+
+# ======================================
+# Reference: the original month-by-month loops
+# ======================================
+
+def reference_fund(commitment, calls, growth, dists):
+    nav = 0
+    navs, cash_flows = [], []
+    for i in range(len(calls)):
+        call = calls[i] * commitment
+        nav = nav * growth[i] + call
+        dist = dists[i] * commitment
+        nav = max(nav - dist, 0)
+        navs.append(nav)
+        cash_flows.append(-call + dist)
+    return navs, cash_flows
+
+
+def default_schedules(fund_life=120):
+    calls = [0.2 / 60 if i < 60 else 0 for i in range(fund_life)]
+    growth = [0.99 if i < 24 else 1.01 if i < 60 else 1.03 for i in range(fund_life)]
+    dists = [0.02 if i >= 60 else 0 for i in range(fund_life)]
+    return calls, growth, dists
+
+
+def reference_portfolio(initial_capital, weights, returns, funds, n_months, cash_rate=0.02):
+    # funds: list of (start_month, navs, cash_flows)
+    def fund_sum(month, column):
+        return sum(fund[column][month - fund[0]] for fund in funds
+                   if 0 <= month - fund[0] < len(fund[1]))
+
+    public_value = initial_capital * sum(weights)
+    cash_balance = initial_capital * (1 - sum(weights))
+    public_values = [public_value]
+    private_navs = [fund_sum(0, 1)]
+    cash_balances = [cash_balance]
+    for month in range(1, n_months):
+        public_value *= 1 + np.dot(weights, returns[month % len(returns)])
+        public_values.append(public_value)
+        private_navs.append(fund_sum(month, 1))
+        cash_balance += fund_sum(month, 2)
+        cash_balance *= 1 + cash_rate / 12
+        cash_balances.append(cash_balance)
+    total = np.array(public_values) + np.array(private_navs) + np.array(cash_balances)
+    return {"public": public_values, "private": private_navs, "cash": cash_balances, "total": total}
+
+
+def random_payload(rng, n_months, starts):
+    assets = ["SPY", "TLT", "VNQ"]
+    weights = rng.dirichlet(np.ones(3)) * 0.8
+    return {
+        "initial_capital": 1_000_000,
+        "public_weights": dict(zip(assets, weights.tolist())),
+        "returns_data": [dict(zip(assets, row.tolist()))
+                         for row in rng.normal(0.005, 0.03, (n_months, 3))],
+        "private_commitments": [{"commitment": float(rng.uniform(5e4, 3e5)), "start_month": start}
+                                for start in starts],
+    }
+
+
+# ======================================
+# Full simulation vs the reference loops
+# ======================================
+
+@pytest.mark.parametrize("n_months, starts", [
+    (5, [0, 2]),
+    (30, []),
+    (60, [0, 0, 12]),
+    (150, [0, 24, -10, 200]),
+])
+def test_run_simulation_matches_reference_loops(n_months, starts):
+    payload = random_payload(np.random.default_rng(n_months), n_months, starts)
+    result = run_simulation(payload)
+
+    assets = list(payload["public_weights"])
+    weights = [payload["public_weights"][asset] for asset in assets]
+    returns = [[row[asset] for asset in assets] for row in payload["returns_data"]]
+    funds = [(item["start_month"], *reference_fund(item["commitment"], *default_schedules()))
+             for item in payload["private_commitments"]]
+    expected = reference_portfolio(payload["initial_capital"], weights, returns, funds, n_months)
+
+    for key in ("public", "private", "cash", "total"):
+        np.testing.assert_allclose(result["portfolio"][key], expected[key], rtol=1e-12, atol=1e-6)
+
+    total = expected["total"]
+    monthly_returns = np.diff(total) / total[:-1]
+    running_max = np.maximum.accumulate(total)
+    irr = npf.irr([-payload["initial_capital"]] + list(np.diff(total)))
+    metrics = result["metrics"]
+    assert metrics["Final Portfolio Value ($)"] == pytest.approx(total[-1], abs=0.01)
+    assert metrics["Annualized Volatility (%)"] == pytest.approx(
+        np.std(monthly_returns) * np.sqrt(12) * 100, abs=0.01)
+    assert metrics["Max Drawdown (%)"] == pytest.approx(
+        np.max((running_max - total) / running_max) * 100, abs=0.01)
+    if np.isnan(irr):
+        assert np.isnan(metrics["Portfolio IRR (%)"])
+    else:
+        assert metrics["Portfolio IRR (%)"] == pytest.approx(irr * 100, abs=0.01)
+
+
+def test_public_returns_wrap_around_when_horizon_exceeds_data():
+    returns = np.random.default_rng(1).normal(0, 0.02, (7, 2))
+    weights = [0.3, 0.5]
+    no_funds = np.zeros((0, 120))
+    result = simulate_total_portfolio(1e6, weights, returns, no_funds, no_funds, n_months=20)
+    expected = reference_portfolio(1e6, weights, returns, [], 20)
+    np.testing.assert_allclose(result["public"], expected["public"], rtol=1e-12)
+    np.testing.assert_allclose(result["cash"], expected["cash"], rtol=1e-12)
+
+
+def test_run_simulation_accepts_column_dict_returns():
+    # The frontend's default request (no CSV uploaded) sends one list per asset
+    payload = {
+        "initial_capital": 1_000_000,
+        "public_weights": {"SPY": 0.6, "TLT": 0.4},
+        "returns_data": {"SPY": [0.01] * 120, "TLT": [0.005] * 120},
+        "private_commitments": [],
+    }
+    result = run_simulation(payload)
+    assert result["metrics"]["Final Portfolio Value ($)"] == 2581091.03
+
+    rows = [{"SPY": 0.01, "TLT": 0.005}] * 120
+    row_result = run_simulation({**payload, "returns_data": rows})
+    np.testing.assert_array_equal(result["portfolio"]["total"], row_result["portfolio"]["total"])
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered")
+def test_metrics_when_portfolio_value_reaches_zero():
+    # A -100% month wipes out an all-public portfolio; later returns divide by 0
+    payload = {
+        "initial_capital": 1_000_000,
+        "public_weights": {"A": 1.0},
+        "returns_data": [{"A": r} for r in (0.01, 0.02, -1.0, 0.01, 0.03)] * 3,
+        "private_commitments": [],
+    }
+    metrics = run_simulation(payload)["metrics"]
+    assert metrics["Final Portfolio Value ($)"] == 0.0
+    assert metrics["Max Drawdown (%)"] == 100.0
+    assert np.isnan(metrics["Annualized Volatility (%)"])
+    assert np.isnan(metrics["Portfolio IRR (%)"])
+
+
+def test_private_investment_matches_reference_loop():
+    # Default 120-month fund: specialized kernel, exact float64 constants
+    fund = PrivateInvestment(commitment=250_000, start_month=0)
+    navs, cash_flows = reference_fund(250_000, *default_schedules())
+    np.testing.assert_array_equal(fund.nav_history, navs)
+    np.testing.assert_array_equal(fund.cash_flows, cash_flows)
+
+    # Custom schedules: general batch kernel
+    calls, growth, dists = default_schedules(90)
+    dists = [0.005] * 90
+    fund = PrivateInvestment(commitment=250_000, start_month=0, fund_life=90,
+                             distribution_schedule=dists)
+    navs, cash_flows = reference_fund(250_000, calls, growth, dists)
+    np.testing.assert_allclose(fund.nav_history, navs, rtol=1e-12)
+    np.testing.assert_allclose(fund.cash_flows, cash_flows, rtol=1e-12)
+
+
+# ======================================
+# IRR vs numpy-financial
+# ======================================
+
+@pytest.mark.parametrize("values", [
+    [-100, 39, 59, 55, 20],
+    [-100, 0, 0, 74],
+    [-100, 100, 0, -7],
+    [-100, 100, 0, 7],
+    [-5, 10.5, 1, -8, 1],
+])
+def test_irr_matches_npf_on_reference_examples(values):
+    assert _irr(np.array(values, dtype=np.float64)) == pytest.approx(npf.irr(values), abs=1e-9)
+
+
+@pytest.mark.parametrize("n_months", [2, 5, 12, 60, 120, 240])
+def test_irr_matches_npf_on_portfolio_shaped_cash_flows(n_months):
+    # [-initial_capital, monthly value changes]: the root is often far below 0
+    rng = np.random.default_rng(n_months)
+    for drift in (-5e3, 0.0, 1e4):
+        cash_flows = np.concatenate(([-1e6], rng.normal(drift, 2e4, n_months - 1)))
+        expected = npf.irr(cash_flows)
+        if np.isnan(expected):
+            assert np.isnan(_irr(cash_flows))
+        else:
+            assert _irr(cash_flows) == pytest.approx(expected, rel=1e-7, abs=1e-9)
+
+
+def test_irr_is_nan_without_sign_change():
+    assert np.isnan(_irr(np.array([1.0, 2.0, 3.0])))
+
+
+# ======================================
+# Private fund start months
+# ======================================
+
+def test_start_months_shift_and_clip_fund_trajectories():
+    navs = np.arange(1.0, 6.0)[np.newaxis].repeat(4, axis=0)  # 4 funds, life 5
+    cash_flows = np.zeros_like(navs)
+    result = simulate_total_portfolio(
+        initial_capital=0.0,
+        public_weights=[1.0],
+        returns_arr=np.zeros((1, 1)),
+        private_navs=navs,
+        private_cash_flows=cash_flows,
+        private_start_months=np.array([0, 2, -3, 40]),
+        n_months=6
+    )
+    # start 0: 1..5 | start 2: shifted by 2 | start -3: last 2 months | start 40: never
+    expected = np.array([1, 2, 3, 4, 5, 0]) + np.array([0, 0, 1, 2, 3, 4]) + np.array([4, 5, 0, 0, 0, 0])
+    np.testing.assert_allclose(result["private"], expected)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 0), ("", 0), (3, 3), ("12", 12), (-4, -4), (6.0, 6),
+])
+def test_start_month_parsing(value, expected):
+    assert _parse_start_month(value) == expected
+
+
+@pytest.mark.parametrize("value", ["3.5", 2.5, "soon", float("nan"), [1]])
+def test_start_month_rejects_non_integers(value):
+    with pytest.raises(ValueError, match="start_month"):
+        _parse_start_month(value)